@@ -0,0 +1,104 @@
+"""
+STS AssumeRole helper shared by main.py and migrations.py.
+
+Assumed-role credentials are cached on disk until shortly before they expire,
+so process restarts (and uvicorn reloads) reuse them instead of calling STS.
+"""
+import os
+import json
+import logging
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+import boto3
+
+logger = logging.getLogger(__name__)
+
+STS_CACHE_FILE = os.path.expanduser(os.environ.get("STS_CACHE_FILE", "~/.cache/app-sts.json"))
+
+# Cached credentials are only reused while they have at least this long left
+EXPIRY_SKEW = timedelta(minutes=5)
+
+def _read_cache() -> Dict[str, Dict[str, str]]:
+    try:
+        with open(STS_CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable STS credentials cache {STS_CACHE_FILE}: {e}")
+        return {}
+
+def _write_cache(cache: Dict[str, Dict[str, str]]):
+    """Persist the cache atomically (temp file + rename) with mode 0600."""
+    cache_dir = os.path.dirname(STS_CACHE_FILE)
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".sts-")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cache, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, STS_CACHE_FILE)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"Could not write STS credentials cache {STS_CACHE_FILE}: {e}")
+
+def _is_fresh(credentials: Dict[str, str]) -> bool:
+    try:
+        expiration = datetime.fromisoformat(credentials["Expiration"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    if expiration.tzinfo is None:
+        # STS expirations are UTC; don't compare naive and aware datetimes
+        expiration = expiration.replace(tzinfo=timezone.utc)
+    return expiration - EXPIRY_SKEW > datetime.now(timezone.utc)
+
+def get_credentials(role_arn: str, session_name: str, region: str,
+                    force_refresh: bool = False) -> Dict[str, str]:
+    """
+    Return credentials for the assumed role, calling STS only when needed.
+
+    Args:
+        role_arn: IAM role ARN to assume
+        session_name: RoleSessionName used for a fresh AssumeRole call
+        region: AWS region of the STS client
+        force_refresh: Skip the cache and always call STS
+
+    Returns:
+        Dict with AccessKeyId, SecretAccessKey, SessionToken and Expiration (ISO 8601)
+    """
+    cache = _read_cache()
+    if not force_refresh:
+        cached: Optional[Dict[str, str]] = cache.get(role_arn)
+        if cached and _is_fresh(cached):
+            logger.info(f"Using cached credentials for IAM role: {role_arn}")
+            return cached
+
+    logger.info(f"Assuming IAM role: {role_arn}")
+    sts_client = boto3.client("sts", region_name=region)
+    assumed_role = sts_client.assume_role(
+        RoleArn=role_arn,
+        RoleSessionName=session_name
+    )
+    credentials = assumed_role["Credentials"]
+    result = {
+        "AccessKeyId": credentials["AccessKeyId"],
+        "SecretAccessKey": credentials["SecretAccessKey"],
+        "SessionToken": credentials["SessionToken"],
+        "Expiration": credentials["Expiration"].isoformat(),
+    }
+    cache[role_arn] = result
+    _write_cache(cache)
+    return result
+
+def to_refresh_metadata(credentials: Dict[str, str]) -> Dict[str, str]:
+    """Convert get_credentials() output to botocore's refreshable-credentials metadata."""
+    return {
+        "access_key": credentials["AccessKeyId"],
+        "secret_key": credentials["SecretAccessKey"],
+        "token": credentials["SessionToken"],
+        "expiry_time": credentials["Expiration"],
+    }
@@ -0,0 +1,50 @@
+"""Shared test fixtures: the app is exercised in-process over ASGI, without a server thread.
+
+The lifespan and client are session-scoped, so startup runs once and the
+DynamoDB connection pool is reused by every test (all tests share the session
+event loop, see pytest.ini). Nothing here is autouse: test_main.py opts in, and
+the tests of the other modules run without the app.
+"""
+import pytest
+from httpx import ASGITransport, AsyncClient
+from main import app
+
+@pytest.fixture(scope="session")
+async def app_lifespan():
+    """Run the app lifespan so the DynamoDB client and writer are available on app.state."""
+    async with app.router.lifespan_context(app):
+        yield
+
+@pytest.fixture(scope="session")
+async def client(app_lifespan):
+    """HTTP client calling the ASGI app directly."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+@pytest.fixture
+def stubs(monkeypatch):
+    """Swap DynamoDB access for plain async stubs driven by a per-test state dict.
+
+    Set state["get"] to the birthday GET should find and state["table_exc"] to
+    an exception for describe_table to raise. Stored birthdays are recorded in
+    state["stored"] and describe_table calls are counted in state["describe_calls"].
+    """
+    state = {"get": None, "stored": [], "table_exc": None, "describe_calls": 0}
+
+    async def get_birthday(username):
+        return state["get"]
+
+    async def store_birthday(username, date_of_birth):
+        state["stored"].append((username, date_of_birth))
+
+    class Table:
+        async def describe_table(self, **params):
+            state["describe_calls"] += 1
+            if state["table_exc"]:
+                raise state["table_exc"]
+            return {"Table": {}}
+
+    monkeypatch.setattr("main.get_birthday", get_birthday)
+    monkeypatch.setattr("main.store_birthday", store_birthday)
+    monkeypatch.setattr(app.state, "dynamodb", Table())
+    return state
@@ -0,0 +1,139 @@
+"""
+Minimal async DynamoDB client speaking the JSON protocol over a persistent aiohttp session.
+
+The service only issues a few fixed-shape calls (GetItem, BatchWriteItem,
+DescribeTable). Each call serializes its body with orjson, signs it with
+botocore's SigV4Auth and POSTs it on one shared connection pool. That skips
+boto3's per-call event hooks, parameter validation and response parsing.
+Methods take and return the same shapes as the botocore client, and errors
+are raised as botocore ClientError.
+"""
+import asyncio
+import hashlib
+import inspect
+import logging
+import random
+from typing import Any, Dict, Optional
+import aiohttp
+import orjson
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.exceptions import ClientError, NoCredentialsError
+
+logger = logging.getLogger(__name__)
+
+TARGET_PREFIX = "DynamoDB_20120810."
+CONTENT_TYPE = "application/x-amz-json-1.0"
+
+MAX_ATTEMPTS = 5
+RETRYABLE_ERROR_CODES = frozenset({
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+    "InternalServerError",
+    "ServiceUnavailable",
+})
+
+def default_endpoint_url(region: str) -> str:
+    suffix = "amazonaws.com.cn" if region.startswith("cn-") else "amazonaws.com"
+    return f"https://dynamodb.{region}.{suffix}"
+
+class DynamoDBHttpClient:
+    """Async DynamoDB client; use as ``async with DynamoDBHttpClient(...) as client``."""
+
+    def __init__(self, credentials, region: str, endpoint_url: Optional[str] = None,
+                 max_connections: int = 128, keepalive_timeout: float = 75):
+        """
+        Args:
+            credentials: botocore/aiobotocore credentials (refreshable credentials are renewed on use)
+            region: AWS region used for signing
+            endpoint_url: DynamoDB endpoint URL (for local development)
+            max_connections: Connection pool size
+            keepalive_timeout: Seconds an idle connection is kept open
+        """
+        self.credentials = credentials
+        self.region = region
+        self.endpoint_url = endpoint_url or default_endpoint_url(region)
+        self._connector_args = {
+            "limit": max_connections,
+            "keepalive_timeout": keepalive_timeout,
+            "ttl_dns_cache": 300,
+        }
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "DynamoDBHttpClient":
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(**self._connector_args),
+            timeout=aiohttp.ClientTimeout(sock_connect=60, sock_read=60),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+
+    async def get_item(self, **params) -> Dict[str, Any]:
+        return await self._call("GetItem", params)
+
+    async def put_item(self, **params) -> Dict[str, Any]:
+        return await self._call("PutItem", params)
+
+    async def batch_write_item(self, **params) -> Dict[str, Any]:
+        return await self._call("BatchWriteItem", params)
+
+    async def describe_table(self, **params) -> Dict[str, Any]:
+        return await self._call("DescribeTable", params)
+
+    async def _signed_headers(self, operation: str, body: bytes) -> Dict[str, str]:
+        if self.credentials is None:
+            raise NoCredentialsError()
+        # aiobotocore credentials return an awaitable (refreshing if needed), botocore ones do not
+        credentials = self.credentials.get_frozen_credentials()
+        if inspect.isawaitable(credentials):
+            credentials = await credentials
+        request = AWSRequest(method="POST", url=self.endpoint_url, data=body, headers={
+            "Content-Type": CONTENT_TYPE,
+            "X-Amz-Target": TARGET_PREFIX + operation,
+            "X-Amz-Content-SHA256": hashlib.sha256(body).hexdigest(),
+        })
+        SigV4Auth(credentials, "dynamodb", self.region).add_auth(request)
+        return dict(request.headers.items())
+
+    async def _call(self, operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        body = orjson.dumps(params)
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            # Re-sign on every attempt: the signature covers the request timestamp
+            headers = await self._signed_headers(operation, body)
+            try:
+                async with self._session.post(self.endpoint_url, data=body, headers=headers) as response:
+                    status = response.status
+                    payload = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                logger.warning("DynamoDB %s connection error (attempt %d): %s", operation, attempt, e)
+                await self._backoff(attempt)
+                continue
+
+            try:
+                data = orjson.loads(payload) if payload else {}
+            except orjson.JSONDecodeError:
+                # e.g. an HTML error page from a proxy
+                data = {}
+            if status == 200:
+                return data
+
+            # Error types look like "com.amazonaws.dynamodb.v20120810#ResourceNotFoundException"
+            code = data.get("__type", "").rpartition("#")[2] or f"HTTP{status}"
+            error = ClientError({
+                "Error": {"Code": code, "Message": data.get("message") or data.get("Message", "")},
+                "ResponseMetadata": {"HTTPStatusCode": status},
+            }, operation)
+            if attempt == MAX_ATTEMPTS or not (status >= 500 or code in RETRYABLE_ERROR_CODES):
+                raise error
+            logger.warning("DynamoDB %s failed with %s (attempt %d), retrying", operation, code, attempt)
+            await self._backoff(attempt)
+
+    @staticmethod
+    async def _backoff(attempt: int):
+        # Full jitter exponential backoff: up to 50ms, 100ms, 200ms, ...
+        await asyncio.sleep(random.uniform(0, 0.05 * 2 ** (attempt - 1)))
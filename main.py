@@ -6,31 +6,66 @@ FastAPI web application with two endpoints:
 Uses Pydantic for input validation. Stores data in DynamoDB.
 """
 import os
+import atexit
+import asyncio
+import functools
+import hashlib
 import logging
-from fastapi import FastAPI, Path, HTTPException, Response
-from pydantic import BaseModel, field_validator
-from typing import Optional
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+from fastapi import FastAPI, Body, Depends, HTTPException, Path, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel
+from pydantic_core import SchemaValidator, ValidationError, core_schema
+from typing import Any, Dict, Optional
 from datetime import date, datetime
-import boto3
+from contextlib import asynccontextmanager
+import aioboto3
+from aiobotocore.credentials import AioRefreshableCredentials
 from botocore.exceptions import ClientError
-from fastapi.concurrency import run_in_threadpool
+import redis.asyncio as aioredis
+from aws_auth import get_credentials, to_refresh_metadata
+from dynamodb_http import DynamoDBHttpClient
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-# Load environment variables from .env if present
+# Load environment variables from .env if present, before anything reads them (LOG_LEVEL included)
 try:
     from dotenv import load_dotenv
     load_dotenv()
 except ImportError:
     pass
 
+# Set up logging: handlers only enqueue records, and a background thread writes
+# them out, so request handlers never block on the log stream
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+log_queue = queue.SimpleQueue()
+logging.basicConfig(level=LOG_LEVEL, handlers=[QueueHandler(log_queue)])
+log_listener = QueueListener(log_queue, logging.StreamHandler(), respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+logger = logging.getLogger(__name__)
+
 DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "users_birthdays")
 IAM_ROLE = os.environ.get("IAM_ROLE")
 AWS_REGION = os.environ.get("AWS_REGION", "eu-central-1")
 DYNAMODB_ENDPOINT_URL = os.environ.get("DYNAMODB_ENDPOINT_URL")
 API_PORT = int(os.environ.get("API_PORT", "8001"))
+REDIS_URL = os.environ.get("REDIS_URL")
+
+# Cache TTLs (seconds) for found birthdays and for "user not found" lookups
+CACHE_TTL = 300
+CACHE_NEGATIVE_TTL = 30
+
+# Write coalescing: BatchWriteItem accepts at most 25 items per call
+BATCH_MAX_ITEMS = 25
+BATCH_MAX_WAIT = 0.01
+BATCH_MAX_ATTEMPTS = 5
+# Unprocessed items are retried with full-jitter exponential backoff: up to 50ms, 100ms, 200ms, ...
+BATCH_RETRY_BASE_DELAY = 0.05
+
+# Background table check backoff (seconds)
+PROBE_INITIAL_DELAY = 0.5
+PROBE_MAX_DELAY = 30
 
 # Debug logging
 logger.info(f"FastAPI Configuration:")
@@ -41,51 +76,235 @@ logger.info(f"  Region: {AWS_REGION}")
 logger.info(f"  Endpoint URL: {DYNAMODB_ENDPOINT_URL}")
 logger.info(f"  IAM Role: {IAM_ROLE}")
 
-# AWS authentication logic
-boto3_resource_kwargs = {"region_name": AWS_REGION}
 if DYNAMODB_ENDPOINT_URL:
-    boto3_resource_kwargs["endpoint_url"] = DYNAMODB_ENDPOINT_URL
     logger.info(f"Using local DynamoDB endpoint: {DYNAMODB_ENDPOINT_URL}")
 
-if IAM_ROLE:
+# AWS authentication logic
+async def get_aws_credentials():
+    """Return the credentials DynamoDB requests are signed with, assuming IAM_ROLE if configured.
+
+    Assumed-role credentials come from the on-disk cache when still valid and
+    are renewed through STS before they expire, so the server never restarts
+    just to pick up new credentials. Without a role, the default credential
+    chain of an aioboto3 session is used.
+    """
+    if not IAM_ROLE:
+        logger.info("Using default AWS credentials or local DynamoDB")
+        return await aioboto3.Session().get_credentials()
+
     logger.info(f"Using IAM role: {IAM_ROLE}")
-    sts_client = boto3.client("sts", region_name=AWS_REGION)
-    assumed_role = sts_client.assume_role(
-        RoleArn=IAM_ROLE,
-        RoleSessionName="FastAPISession"
+    credentials = await asyncio.to_thread(
+        get_credentials, IAM_ROLE, "FastAPISession", AWS_REGION
     )
-    credentials = assumed_role["Credentials"]
-    dynamodb = boto3.resource(
-        "dynamodb",
-        aws_access_key_id=credentials["AccessKeyId"],
-        aws_secret_access_key=credentials["SecretAccessKey"],
-        aws_session_token=credentials["SessionToken"],
-        **boto3_resource_kwargs
+
+    async def refresh():
+        fresh = await asyncio.to_thread(
+            get_credentials, IAM_ROLE, "FastAPISession", AWS_REGION, force_refresh=True
+        )
+        return to_refresh_metadata(fresh)
+
+    return AioRefreshableCredentials.create_from_metadata(
+        metadata=to_refresh_metadata(credentials),
+        refresh_using=refresh,
+        method="sts-assume-role",
     )
-else:
-    logger.info("Using default AWS credentials or local DynamoDB")
-    dynamodb = boto3.resource("dynamodb", **boto3_resource_kwargs)
 
-table = dynamodb.Table(DYNAMODB_TABLE)
-logger.info(f"Initialized DynamoDB table: {DYNAMODB_TABLE}")
+async def probe_table(app: FastAPI, dynamodb):
+    """Retry DescribeTable with exponential backoff until it succeeds, then mark the app ready.
 
-# Test table connection
-try:
-    table.load()
+    Runs in the background so startup never waits on (or dies from) DynamoDB.
+    """
+    delay = PROBE_INITIAL_DELAY
+    while True:
+        try:
+            await dynamodb.describe_table(TableName=DYNAMODB_TABLE)
+            break
+        except ClientError as e:
+            logger.error("Failed to connect to DynamoDB table: %s", e)
+            if e.response['Error']['Code'] == 'ResourceNotFoundException':
+                logger.error("Table '%s' does not exist!", DYNAMODB_TABLE)
+            elif e.response['Error']['Code'] == 'UnrecognizedClientException':
+                logger.error("Invalid endpoint URL or connection issue")
+        except Exception as e:
+            logger.error("Connection error to DynamoDB: %s", e)
+        logger.warning("Retrying DynamoDB table check in %.1fs", delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, PROBE_MAX_DELAY)
+    app.state.db_ready = True
     logger.info("Successfully connected to DynamoDB table")
-except ClientError as e:
-    logger.error(f"Failed to connect to DynamoDB table: {e}")
-    if e.response['Error']['Code'] == 'ResourceNotFoundException':
-        logger.error(f"Table '{DYNAMODB_TABLE}' does not exist!")
-    elif e.response['Error']['Code'] == 'UnrecognizedClientException':
-        logger.error("Invalid endpoint URL or connection issue")
-    else:
-        logger.error(f"Unexpected error: {e}")
-except Exception as e:
-    logger.error(f"Connection error to DynamoDB: {e}")
-    logger.warning("Application will continue but DynamoDB operations may fail")
 
-app = FastAPI()
+class _PendingWrite:
+    """A birthday waiting to be written, and every writer waiting on it."""
+
+    __slots__ = ("username", "date_of_birth", "futures", "attempt")
+
+    def __init__(self, username: str, date_of_birth: str, future: asyncio.Future):
+        self.username = username
+        self.date_of_birth = date_of_birth
+        self.futures = [future]
+        self.attempt = 1
+
+    def resolve(self, exception: Optional[BaseException] = None):
+        # Writers learn the value that was actually persisted, which may be a newer one than theirs
+        for future in self.futures:
+            if future.done():
+                continue
+            if exception is None:
+                future.set_result(self.date_of_birth)
+            else:
+                future.set_exception(exception)
+
+class WriteCoalescer:
+    """Coalesce concurrent birthday writes into BatchWriteItem calls.
+
+    Writers enqueue an item and wait on a future; a background task drains up
+    to BATCH_MAX_ITEMS items (or whatever arrives within BATCH_MAX_WAIT) and
+    writes them with a single request. Unprocessed items are requeued after a
+    backoff delay.
+
+    There is at most one unsent write per username: a newer PUT replaces its
+    value and joins its writers, and an unprocessed item whose username has a
+    newer unsent write is folded into it instead of being retried. Writers
+    therefore share the outcome of the write that superseded theirs, and a
+    stale retry can never land after a newer value.
+    """
+
+    def __init__(self, client, table_name: str):
+        self.client = client
+        self.table_name = table_name
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        # Unsent (queued or backing off) write per username
+        self._pending: Dict[str, _PendingWrite] = {}
+        # Unprocessed items waiting out their backoff delay
+        self._delayed: Dict[asyncio.TimerHandle, _PendingWrite] = {}
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        for handle in self._delayed:
+            handle.cancel()
+        self._delayed.clear()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        for write in self._pending.values():
+            write.resolve(exception=RuntimeError("Write coalescer stopped"))
+        self._pending.clear()
+
+    async def put(self, username: str, date_of_birth: str) -> str:
+        """Store a birthday; returns the value persisted, which is newer if another PUT overtook this one."""
+        future = asyncio.get_running_loop().create_future()
+        write = self._pending.get(username)
+        if write:
+            write.date_of_birth = date_of_birth
+            write.futures.append(future)
+        else:
+            write = self._pending[username] = _PendingWrite(username, date_of_birth, future)
+            self.queue.put_nowait(write)
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + BATCH_MAX_WAIT
+            while len(batch) < BATCH_MAX_ITEMS:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch):
+        # From here on a newer PUT starts a new write instead of changing these
+        for write in batch:
+            del self._pending[write.username]
+
+        try:
+            response = await self.client.batch_write_item(RequestItems={
+                self.table_name: [
+                    {"PutRequest": {"Item": {"username": {"S": write.username}, "dateOfBirth": {"S": write.date_of_birth}}}}
+                    for write in batch
+                ]
+            })
+        except Exception as e:
+            for write in batch:
+                write.resolve(exception=e)
+            return
+
+        unprocessed = {
+            request["PutRequest"]["Item"]["username"]["S"]
+            for request in response.get("UnprocessedItems", {}).get(self.table_name, [])
+        }
+        for write in batch:
+            newer = self._pending.get(write.username)
+            if write.username not in unprocessed:
+                write.resolve()
+            elif newer:
+                # Not written, and superseded anyway: share the newer write's outcome
+                newer.futures.extend(write.futures)
+            elif write.attempt >= BATCH_MAX_ATTEMPTS:
+                write.resolve(exception=RuntimeError(
+                    f"Write for '{write.username}' left unprocessed after {write.attempt} attempts"
+                ))
+            else:
+                write.attempt += 1
+                self._pending[write.username] = write
+                self._requeue_later(write)
+
+    def _requeue_later(self, write: _PendingWrite):
+        def requeue():
+            del self._delayed[handle]
+            self.queue.put_nowait(write)
+
+        delay = random.uniform(0, BATCH_RETRY_BASE_DELAY * 2 ** (write.attempt - 2))
+        handle = asyncio.get_running_loop().call_later(delay, requeue)
+        self._delayed[handle] = write
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Hold one DynamoDB client (and its connection pool) for the app lifetime."""
+    credentials = await get_aws_credentials()
+    async with DynamoDBHttpClient(credentials, AWS_REGION, DYNAMODB_ENDPOINT_URL) as dynamodb:
+        app.state.dynamodb = dynamodb
+        logger.info(f"Initialized DynamoDB client for table: {DYNAMODB_TABLE}")
+        app.state.db_ready = False
+        probe = asyncio.create_task(probe_table(app, dynamodb))
+        app.state.writer = WriteCoalescer(dynamodb, DYNAMODB_TABLE)
+        app.state.writer.start()
+        try:
+            yield
+        finally:
+            probe.cancel()
+            await app.state.writer.stop()
+            if redis_client:
+                await redis_client.aclose()
+
+# Optional Redis read-through cache in front of DynamoDB
+redis_client = aioredis.from_url(REDIS_URL) if REDIS_URL else None
+if redis_client:
+    logger.info("Redis cache enabled")
+else:
+    logger.info("Redis cache disabled (REDIS_URL not set)")
+
+app = FastAPI(lifespan=lifespan)
+
+@app.get("/healthz")
+async def readiness():
+    """Readiness probe: 503 until the background table check has succeeded."""
+    if not app.state.db_ready:
+        raise HTTPException(status_code=503, detail="DynamoDB not ready")
+    return {"status": "ready"}
 
 @app.get("/hello/healthcheck")
 async def health_check():
@@ -98,7 +317,7 @@ async def health_check():
     """
     try:
         # Test DynamoDB connection by describing the table
-        table.load()
+        await app.state.dynamodb.describe_table(TableName=DYNAMODB_TABLE)
 
         # Return healthy status
         return {
@@ -111,7 +330,7 @@ async def health_check():
             }
         }
     except ClientError as e:
-        logger.error(f"Health check failed - DynamoDB error: {e}")
+        logger.error("Health check failed - DynamoDB error: %s", e)
         raise HTTPException(
             status_code=503,
             detail={
@@ -126,7 +345,7 @@ async def health_check():
             }
         )
     except Exception as e:
-        logger.error(f"Health check failed - unexpected error: {e}")
+        logger.error("Health check failed - unexpected error: %s", e)
         raise HTTPException(
             status_code=503,
             detail={
@@ -141,91 +360,241 @@ async def health_check():
             }
         )
 
-class HelloRequest(BaseModel):
-    dateOfBirth: date
+# PUT body schema, for the OpenAPI docs; validation is done by parse_hello_request()
+HELLO_REQUEST_SCHEMA = {
+    "type": "object",
+    "required": ["dateOfBirth"],
+    "properties": {"dateOfBirth": {"type": "string", "format": "date"}},
+}
+
+@functools.lru_cache(maxsize=1)
+def _hello_request_validator(today_ordinal: int) -> SchemaValidator:
+    # The "before today" bound is baked into the schema, so rebuild it once per day
+    return SchemaValidator(core_schema.typed_dict_schema({
+        "dateOfBirth": core_schema.typed_dict_field(
+            core_schema.date_schema(lt=date.fromordinal(today_ordinal))
+        ),
+    }))
 
-    @field_validator("dateOfBirth")
-    def date_must_be_before_today(cls, v):
-        if v >= date.today():
-            raise ValueError("dateOfBirth must be a date before today.")
-        return v
+def parse_hello_request(body: Any) -> date:
+    """Validate a PUT body with a precompiled pydantic-core validator and return dateOfBirth.
+
+    Raises RequestValidationError (422) in the same shape FastAPI uses for models.
+    """
+    validator = _hello_request_validator(date.today().toordinal())
+    try:
+        return validator.validate_python(body)["dateOfBirth"]
+    except ValidationError as e:
+        errors = []
+        for error in e.errors(include_url=False):
+            if error["type"] == "less_than":
+                error = {
+                    "type": "value_error",
+                    "loc": error["loc"],
+                    "msg": "Value error, dateOfBirth must be a date before today.",
+                    "input": error["input"],
+                }
+            errors.append({**error, "loc": ("body", *error["loc"])})
+        raise RequestValidationError(errors, body=body)
+
+class HelloResponse(BaseModel):
+    message: str
+
+def _cache_key(username: str) -> str:
+    return f"bday:{username}"
+
+async def cache_get(username: str) -> Optional[bytes]:
+    """Return the cached value for a user, or None on miss or cache failure.
+
+    An empty value is a cached "user not found" result.
+    """
+    if redis_client is None:
+        return None
+    try:
+        return await redis_client.get(_cache_key(username))
+    except Exception as e:
+        logger.warning("Redis get failed for '%s', falling back to DynamoDB: %s", username, e)
+        return None
+
+async def cache_set(username: str, value: str, ttl: int, nx: bool = False):
+    """Cache a lookup result; with nx=True an existing entry is left untouched."""
+    if redis_client is None:
+        return
+    try:
+        await redis_client.set(_cache_key(username), value, ex=ttl, nx=nx)
+    except Exception as e:
+        logger.warning("Redis set failed for '%s': %s", username, e)
 
 async def store_birthday(username: str, date_of_birth: str):
-    logger.info(f"Storing birthday for user '{username}': {date_of_birth}")
-    def _put():
-        try:
-            table.put_item(Item={"username": username, "dateOfBirth": date_of_birth})
-            logger.info(f"Successfully stored birthday for '{username}'")
-        except ClientError as e:
-            logger.error(f"Failed to store birthday for '{username}': {e}")
-            raise HTTPException(status_code=500, detail="Failed to store birthday")
-        except Exception as e:
-            logger.error(f"Connection error while storing birthday for '{username}': {e}")
-            raise HTTPException(status_code=503, detail="Database connection error")
-    await run_in_threadpool(_put)
+    logger.debug("put user=%s dob=%s", username, date_of_birth)
+    try:
+        # A PUT that raced with a newer one for the same user resolves with the newer value
+        date_of_birth = await app.state.writer.put(username, date_of_birth)
+        logger.debug("put user=%s stored dob=%s", username, date_of_birth)
+    except ClientError as e:
+        logger.error("Failed to store birthday for '%s': %s", username, e)
+        raise HTTPException(status_code=500, detail="Failed to store birthday")
+    except Exception as e:
+        logger.error("Connection error while storing birthday for '%s': %s", username, e)
+        raise HTTPException(status_code=503, detail="Database connection error")
+    # Write-through so a GET right after a PUT sees the new value
+    await cache_set(username, date_of_birth, CACHE_TTL)
 
 async def get_birthday(username: str) -> Optional[str]:
-    logger.info(f"Getting birthday for user '{username}'")
-    def _get():
-        try:
-            response = table.get_item(Key={"username": username})
-            item = response.get("Item", {})
-            date_of_birth = item.get("dateOfBirth")
-            if date_of_birth:
-                logger.info(f"Found birthday for '{username}': {date_of_birth}")
-            else:
-                logger.info(f"No birthday found for '{username}'")
-            return date_of_birth
-        except ClientError as e:
-            logger.error(f"Failed to get birthday for '{username}': {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Connection error while getting birthday for '{username}': {e}")
-            return None
-    return await run_in_threadpool(_get)
+    logger.debug("get user=%s", username)
+    cached = await cache_get(username)
+    if cached is not None:
+        logger.debug("get user=%s cache hit", username)
+        return cached.decode() or None
+
+    try:
+        # Low-level request shapes skip the resource layer's (de)serialization;
+        # the projection avoids returning the key we already have
+        response = await app.state.dynamodb.get_item(
+            TableName=DYNAMODB_TABLE,
+            Key={"username": {"S": username}},
+            ProjectionExpression="dateOfBirth",
+        )
+    except ClientError as e:
+        # Failed lookups are not cached
+        logger.error("Failed to get birthday for '%s': %s", username, e)
+        return None
+    except Exception as e:
+        logger.error("Connection error while getting birthday for '%s': %s", username, e)
+        return None
+
+    item = response.get("Item", {})
+    date_of_birth = item.get("dateOfBirth", {}).get("S")
+    if date_of_birth:
+        logger.debug("get user=%s dob=%s", username, date_of_birth)
+        # NX: never overwrite a PUT's write-through that landed while we read DynamoDB
+        await cache_set(username, date_of_birth, CACHE_TTL, nx=True)
+    else:
+        logger.debug("get user=%s not found", username)
+        await cache_set(username, "", CACHE_NEGATIVE_TTL, nx=True)
+    return date_of_birth
+
+def _rd(y: int, m: int, d: int) -> int:
+    """Rata Die day number of a proleptic Gregorian date (0001-01-01 is day 1)."""
+    # Count years from March, so the leap day is the last day of the year
+    if m < 3:
+        y -= 1
+    return 365 * y + y // 4 - y // 100 + y // 400 + (153 * ((m + 9) % 12) + 2) // 5 + d - 306
+
+def _birthday_rd(year: int, month: int, day: int) -> int:
+    # Feb 29 birthdays fall on Mar 1 in non-leap years
+    if month == 2 and day == 29 and not (year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)):
+        month, day = 3, 1
+    return _rd(year, month, day)
 
-def calculate_days_until_birthday(birth_date_str: str) -> int:
+def _days_until(ty: int, tm: int, td: int, by: int, bm: int, bd: int) -> int:
+    """Days from today (ty-tm-td) to the next birthday of someone born on by-bm-bd."""
+    today = _rd(ty, tm, td)
+    # This year's birthday; if it has passed, use next year's
+    days_until = _birthday_rd(ty, bm, bd) - today
+    if days_until < 0:
+        days_until = _birthday_rd(ty + 1, bm, bd) - today
+    return days_until
+
+@functools.lru_cache(maxsize=4096)
+def _days_until_birthday(birth_date_str: str, today_ordinal: int) -> int:
+    # Keyed on today's ordinal, so cached results naturally expire at midnight
+    # Stored dates are always validated YYYY-MM-DD strings, so slice instead of building a date
+    by, bm, bd = int(birth_date_str[0:4]), int(birth_date_str[5:7]), int(birth_date_str[8:10])
+    today = date.fromordinal(today_ordinal)
+    return _days_until(today.year, today.month, today.day, by, bm, bd)
+
+def calculate_days_until_birthday(birth_date_str: str, today: Optional[date] = None) -> int:
     """Calculate days until next birthday."""
-    birth_date = datetime.strptime(birth_date_str, "%Y-%m-%d").date()
-    today = date.today()
-    
-    # Create this year's birthday
-    this_year_birthday = birth_date.replace(year=today.year)
+    if today is None:
+        today = date.today()
+    return _days_until_birthday(birth_date_str, today.toordinal())
+
+@functools.lru_cache(maxsize=16384)
+def build_greeting(username: str, date_of_birth: str, today_ordinal: int) -> str:
+    """Greeting for a user with a known birthday; stable for the whole day, so memoized."""
+    days_until_birthday = _days_until_birthday(date_of_birth, today_ordinal)
     
-    # If this year's birthday has passed, calculate for next year
-    if this_year_birthday < today:
-        next_birthday = birth_date.replace(year=today.year + 1)
+    if days_until_birthday == 0:
+        return f"Hello, {username}! Happy birthday!"
     else:
-        next_birthday = this_year_birthday
-    
-    # Calculate days difference
-    days_until = (next_birthday - today).days
-    return days_until
+        day_text = "day" if days_until_birthday == 1 else "days"
+        return f"Hello, {username}! Your birthday is in {days_until_birthday} {day_text}"
+
+USERNAME_PATTERN = "^[A-Za-z]{1,50}$"
+
+def validate_username(
+    username: str = Path(
+        description="1-50 letters (A-Z, a-z)",
+        # Documented for OpenAPI only; enforced below without a regex match
+        json_schema_extra={"pattern": USERNAME_PATTERN, "minLength": 1, "maxLength": 50},
+    ),
+) -> str:
+    """Validate the username path parameter: 1-50 ASCII letters.
 
-@app.put("/hello/{username}")
+    str.isascii()/isalpha() run in C, avoiding a regex match per request.
+    """
+    if not (1 <= len(username) <= 50 and username.isascii() and username.isalpha()):
+        # Same error shape FastAPI produces for a Path(pattern=...) mismatch
+        raise RequestValidationError([{
+            "type": "string_pattern_mismatch",
+            "loc": ("path", "username"),
+            "msg": f"String should match pattern '{USERNAME_PATTERN}'",
+            "input": username,
+            "ctx": {"pattern": USERNAME_PATTERN},
+        }])
+    return username
+
+@app.put(
+    "/hello/{username}",
+    openapi_extra={"requestBody": {"required": True, "content": {"application/json": {"schema": HELLO_REQUEST_SCHEMA}}}},
+)
 async def put_hello(
-    username: str = Path(..., min_length=1, max_length=50, pattern=r"^[A-Za-z]+$"),
-    body: HelloRequest = None
+    username: str = Depends(validate_username),
+    body: Any = Body(None)
 ):
-    if not body:
+    if body is None:
         raise HTTPException(status_code=422, detail="Request body required.")
-    await store_birthday(username, body.dateOfBirth.isoformat())
+    date_of_birth = parse_hello_request(body)
+    await store_birthday(username, date_of_birth.isoformat())
     return Response(status_code=204)
 
-@app.get("/hello/{username}")
-async def get_hello(username: str = Path(..., min_length=1, max_length=50, pattern=r"^[A-Za-z]+$")):
+def compute_etag(username: str, date_of_birth: Optional[str], today: date) -> str:
+    """ETag for a greeting; it only changes with the stored birthday or the calendar day."""
+    digest = hashlib.blake2b(
+        f"{username}|{date_of_birth or ''}|{today.toordinal()}".encode(), digest_size=8
+    ).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+@app.get("/hello/{username}", response_model=HelloResponse)
+async def get_hello(request: Request, response: Response, username: str = Depends(validate_username)):
+    today = date.today()
     date_of_birth = await get_birthday(username)
+
+    etag = compute_etag(username, date_of_birth, today)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, max-age=60"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers)
+    response.headers.update(cache_headers)
+
     if date_of_birth:
-        days_until_birthday = calculate_days_until_birthday(date_of_birth)
-        
-        if days_until_birthday == 0:
-            return {"message": f"Hello, {username}! Happy birthday!"}
-        else:
-            day_text = "day" if days_until_birthday == 1 else "days"
-            return {"message": f"Hello, {username}! Your birthday is in {days_until_birthday} {day_text}"}
+        return {"message": build_greeting(username, date_of_birth, today.toordinal())}
     
     return {"message": "user not found"}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=API_PORT, reload=True)
+    # Workers default to one per CPU; each builds its own DynamoDB client in the lifespan,
+    # after the fork. RELOAD=1 is for development only (uvicorn then runs a single worker).
+    uvicorn.run(
+        "main:app", host="0.0.0.0", port=API_PORT,
+        workers=int(os.environ.get("WEB_CONCURRENCY") or os.cpu_count() or 1),
+        reload=os.environ.get("RELOAD", "").strip().lower() in ("1", "true", "yes", "on"),
+        loop="uvloop", http="httptools",
+    )
@@ -11,11 +11,20 @@ Usage:
 import json
 import os
 import sys
+import time
 import argparse
 import logging
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Set
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
+from aws_auth import get_credentials
+
+# orjson parses much faster than the stdlib; fall back if it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -43,19 +52,7 @@ class DynamoDBMigrator:
         # AWS authentication logic (same as main.py)
         if iam_role:
             logger.info(f"Using IAM role: {iam_role}")
-            sts_client = boto3.client("sts", region_name=region)
-            assumed_role = sts_client.assume_role(
-                RoleArn=iam_role,
-                RoleSessionName="MigrationSession"
-            )
-            credentials = assumed_role["Credentials"]
-            self.dynamodb = boto3.resource(
-                "dynamodb",
-                aws_access_key_id=credentials["AccessKeyId"],
-                aws_secret_access_key=credentials["SecretAccessKey"],
-                aws_session_token=credentials["SessionToken"],
-                **client_kwargs
-            )
+            credentials = get_credentials(iam_role, "MigrationSession", region)
             self.client = boto3.client(
                 "dynamodb",
                 aws_access_key_id=credentials["AccessKeyId"],
@@ -65,7 +62,6 @@ class DynamoDBMigrator:
             )
         else:
             logger.info("Using default AWS credentials or local DynamoDB")
-            self.dynamodb = boto3.resource("dynamodb", **client_kwargs)
             self.client = boto3.client("dynamodb", **client_kwargs)
         
         logger.info(f"Connected to DynamoDB at: {endpoint_url or 'AWS'}")
@@ -81,8 +77,10 @@ class DynamoDBMigrator:
             List of table configurations
         """
         try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
+            with open(config_file, 'rb') as f:
+                data = f.read()
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            config = orjson.loads(data) if orjson else json.loads(data)
             
             tables = config.get("tables", [])
             logger.info(f"Loaded {len(tables)} table configurations from {config_file}")
@@ -94,44 +92,18 @@ class DynamoDBMigrator:
             logger.error(f"Invalid JSON in configuration file: {e}")
             raise
 
-    def table_exists(self, table_name: str) -> bool:
-        """
-        Check if a table exists.
-        
-        Args:
-            table_name: Name of the table to check
-            
-        Returns:
-            True if table exists, False otherwise
-        """
-        try:
-            table = self.dynamodb.Table(table_name)
-            table.load()
-            return True
-        except ClientError as e:
-            if e.response['Error']['Code'] == 'ResourceNotFoundException':
-                return False
-            else:
-                logger.error(f"Error checking if table {table_name} exists: {e}")
-                return False
-
-    def create_table(self, table_config: Dict[str, Any]) -> bool:
+    def start_table_creation(self, table_config: Dict[str, Any]) -> bool:
         """
-        Create a DynamoDB table based on configuration.
+        Issue the CreateTable request for a table without waiting for it to become active.
         
         Args:
             table_config: Table configuration dictionary
             
         Returns:
-            True if table created successfully, False otherwise
+            True if the table is being (or was already) created, False otherwise
         """
         table_name = table_config["name"]
         
-        # Check if table already exists
-        if self.table_exists(table_name):
-            logger.info(f"Table '{table_name}' already exists, skipping creation")
-            return True
-        
         try:
             # Convert key schema to proper DynamoDB API format
             key_schema = []
@@ -167,18 +139,12 @@ class DynamoDBMigrator:
             # Create the table
             logger.info(f"Creating table '{table_name}'...")
             self.client.create_table(**create_params)
-            
-            # Wait for table to be created
-            waiter = self.client.get_waiter('table_exists')
-            waiter.wait(TableName=table_name)
-            
-            logger.info(f"Successfully created table '{table_name}'")
             return True
             
         except ClientError as e:
             error_code = e.response['Error']['Code']
             if error_code == 'ResourceInUseException':
-                logger.warning(f"Table '{table_name}' is being created by another process")
+                logger.info(f"Table '{table_name}' already exists")
                 return True
             else:
                 logger.error(f"Failed to create table '{table_name}': {e}")
@@ -187,6 +153,47 @@ class DynamoDBMigrator:
             logger.error(f"Unexpected error creating table '{table_name}': {e}")
             return False
 
+    def wait_for_tables(self, table_names: List[str], delay: float = 2, timeout: float = 600) -> Set[str]:
+        """
+        Wait for tables to become ACTIVE, polling all of them in a single loop.
+        
+        Args:
+            table_names: Names of the tables to wait for
+            delay: Seconds to sleep between polling rounds
+            timeout: Maximum number of seconds to wait
+            
+        Returns:
+            Names of the tables that did not become active
+        """
+        pending = set(table_names)
+        failed = set()
+        deadline = time.monotonic() + timeout
+        
+        while pending:
+            for table_name in sorted(pending):
+                try:
+                    status = self.client.describe_table(TableName=table_name)["Table"]["TableStatus"]
+                except ClientError as e:
+                    if e.response['Error']['Code'] == 'ResourceNotFoundException':
+                        # Not visible yet, poll again next round
+                        continue
+                    logger.error(f"Failed to check status of table '{table_name}': {e}")
+                    pending.discard(table_name)
+                    failed.add(table_name)
+                    continue
+                if status == "ACTIVE":
+                    logger.info(f"Successfully created table '{table_name}'")
+                    pending.discard(table_name)
+            
+            if pending:
+                if time.monotonic() >= deadline:
+                    logger.error(f"Timed out waiting for tables to become active: {', '.join(sorted(pending))}")
+                    failed |= pending
+                    break
+                time.sleep(delay)
+        
+        return failed
+
     def list_tables(self) -> List[str]:
         """
         List all tables in the DynamoDB instance.
@@ -195,12 +202,46 @@ class DynamoDBMigrator:
             List of table names
         """
         try:
-            response = self.client.list_tables()
-            return response.get("TableNames", [])
+            return self._list_table_names()
         except Exception as e:
             logger.error(f"Failed to list tables: {e}")
             return []
 
+    def _list_table_names(self) -> List[str]:
+        # ListTables returns at most 100 names per page
+        tables = []
+        for page in self.client.get_paginator("list_tables").paginate():
+            tables.extend(page.get("TableNames", []))
+        return tables
+
+    def existing_tables(self, table_names: List[str]) -> Set[str]:
+        """
+        Find which of the given tables already exist.
+        
+        Uses a single ListTables call, falling back to a DescribeTable per table
+        when ListTables is not allowed (it cannot be scoped to a table ARN).
+        
+        Args:
+            table_names: Names of the tables to look for
+            
+        Returns:
+            Names of the tables that exist
+        """
+        try:
+            return set(self._list_table_names()) & set(table_names)
+        except ClientError as e:
+            logger.warning(f"Failed to list tables, describing them one by one: {e}")
+        
+        existing = set()
+        for table_name in table_names:
+            try:
+                self.client.describe_table(TableName=table_name)
+                existing.add(table_name)
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ResourceNotFoundException':
+                    logger.error(f"Failed to check table '{table_name}': {e}")
+        return existing
+
     def run_migrations(self, config_file: str) -> bool:
         """
         Run all migrations from the configuration file.
@@ -219,11 +260,23 @@ class DynamoDBMigrator:
                 logger.warning("No table configurations found")
                 return True
             
-            # Create each table
+            existing = self.existing_tables([table_config["name"] for table_config in table_configs])
+            new_configs = []
             success_count = 0
             for table_config in table_configs:
-                if self.create_table(table_config):
+                if table_config["name"] in existing:
+                    logger.info(f"Table '{table_config['name']}' already exists, skipping creation")
                     success_count += 1
+                else:
+                    new_configs.append(table_config)
+            
+            if new_configs:
+                # Issue all CreateTable requests concurrently, then wait for all of them at once
+                with ThreadPoolExecutor(max_workers=min(16, len(new_configs))) as executor:
+                    started = list(executor.map(self.start_table_creation, new_configs))
+                creating = [config["name"] for config, ok in zip(new_configs, started) if ok]
+                failed = self.wait_for_tables(creating)
+                success_count += len(creating) - len(failed)
             
             logger.info(f"Migration completed: {success_count}/{len(table_configs)} tables created successfully")
             return success_count == len(table_configs)
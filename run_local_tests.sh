@@ -1,5 +1,9 @@
 #!/bin/bash -e
 
+# Extra arguments are passed to pytest, e.g. "./run_local_tests.sh -n auto --dist=loadscope"
+# to run on all CPU cores with pytest-xdist. That only pays off for large runs: each worker
+# re-imports the app and runs its lifespan.
+
 echo "Running local tests..."
 
 # Install required packages
@@ -73,7 +77,7 @@ if [ "$DYNAMODB_RUNNING" = true ] && [ "$FASTAPI_RUNNING" = true ]; then
             
             # Run tests
             echo "Running tests..."
-            python -m pytest test_main.py -v --tb=short
+            python -m pytest -v --tb=short "$@"
             TEST_EXIT_CODE=$?
             
             # Exit with test result
@@ -129,7 +133,7 @@ elif [ "$DYNAMODB_RUNNING" = true ] && [ "$FASTAPI_RUNNING" = false ]; then
             
             # Run tests
             echo "Running tests..."
-            python -m pytest test_main.py -v --tb=short
+            python -m pytest -v --tb=short "$@"
             TEST_EXIT_CODE=$?
             
             # Exit with test result
@@ -160,7 +164,7 @@ elif [ "$DYNAMODB_RUNNING" = true ] && [ "$FASTAPI_RUNNING" = false ]; then
             
             # Run tests
             echo "Running tests..."
-            python -m pytest test_main.py -v --tb=short
+            python -m pytest -v --tb=short "$@"
             TEST_EXIT_CODE=$?
             
             # Stop FastAPI
@@ -224,7 +228,7 @@ python migrations.py --env local --endpoint http://localhost:8000
 
 # Run tests
 echo "Running tests..."
-python -m pytest test_main.py -v --tb=short
+python -m pytest -v --tb=short "$@"
 TEST_EXIT_CODE=$?
 
 # Stop local environment
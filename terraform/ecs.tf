@@ -48,6 +48,11 @@ resource "aws_ecs_task_definition" "app" {
         {
           name  = "AWS_REGION"
           value = var.aws_region
+        },
+        {
+          # os.cpu_count() reports the host's vCPUs, not the Fargate CPU quota
+          name  = "WEB_CONCURRENCY"
+          value = tostring(var.app_workers)
         }
       ]
 
@@ -88,6 +88,12 @@ resource "aws_iam_role_policy" "application_dynamodb_policy" {
           "arn:aws:dynamodb:${var.aws_region}:*:table/${var.dynamodb_table_prefix}*",
           "arn:aws:dynamodb:${var.aws_region}:*:table/${var.dynamodb_table_prefix}*/index/*"
         ]
+      },
+      {
+        # ListTables cannot be scoped to a table ARN; migrations use it to skip existing tables
+        Effect   = "Allow"
+        Action   = ["dynamodb:ListTables"]
+        Resource = "*"
       }
     ]
   })
@@ -55,6 +55,12 @@ variable "fargate_memory" {
   default     = 512
 }
 
+variable "app_workers" {
+  description = "Number of uvicorn worker processes per container (sized to fargate_cpu and fargate_memory)"
+  type        = number
+  default     = 1
+}
+
 # Domain Configuration
 variable "domain_name" {
   description = "Domain name for the application"
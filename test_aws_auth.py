@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for aws_auth.py: the on-disk STS credentials cache.
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import orjson
+import aws_auth
+from main import get_aws_credentials
+
+class TestAwsAuth:
+    """Test the on-disk cache around STS AssumeRole."""
+
+    role = "arn:aws:iam::123456789012:role/app"
+
+    @pytest.fixture(autouse=True)
+    def cache_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "sts.json"
+        monkeypatch.setattr(aws_auth, "STS_CACHE_FILE", str(path))
+        return path
+
+    @pytest.fixture(autouse=True)
+    def sts(self):
+        with patch("aws_auth.boto3.client") as mock_client:
+            sts = mock_client.return_value
+            sts.assume_role.return_value = {"Credentials": {
+                "AccessKeyId": "AKIDNEW",
+                "SecretAccessKey": "secret",
+                "SessionToken": "token",
+                "Expiration": datetime.now(timezone.utc) + timedelta(hours=1),
+            }}
+            yield sts
+
+    def cached(self, expires_in, access_key="AKIDCACHED"):
+        expiration = datetime.now(timezone.utc) + expires_in
+        return {self.role: {"AccessKeyId": access_key, "SecretAccessKey": "secret",
+                            "SessionToken": "token", "Expiration": expiration.isoformat()}}
+
+    def test_fresh_cached_credentials_are_reused(self, cache_file, sts):
+        cache_file.write_bytes(orjson.dumps(self.cached(timedelta(hours=1))))
+        credentials = aws_auth.get_credentials(self.role, "Test", "eu-central-1")
+        assert credentials["AccessKeyId"] == "AKIDCACHED"
+        sts.assume_role.assert_not_called()
+
+    def test_credentials_expiring_within_skew_are_renewed(self, cache_file, sts):
+        cache_file.write_bytes(orjson.dumps(self.cached(aws_auth.EXPIRY_SKEW - timedelta(minutes=1))))
+        credentials = aws_auth.get_credentials(self.role, "Test", "eu-central-1")
+        assert credentials["AccessKeyId"] == "AKIDNEW"
+        assert orjson.loads(cache_file.read_bytes())[self.role]["AccessKeyId"] == "AKIDNEW"
+
+    def test_force_refresh_skips_the_cache(self, cache_file, sts):
+        cache_file.write_bytes(orjson.dumps(self.cached(timedelta(hours=1))))
+        credentials = aws_auth.get_credentials(self.role, "Test", "eu-central-1", force_refresh=True)
+        assert credentials["AccessKeyId"] == "AKIDNEW"
+        sts.assume_role.assert_called_once_with(RoleArn=self.role, RoleSessionName="Test")
+
+    def test_unreadable_cache_falls_back_to_sts(self, cache_file, sts):
+        cache_file.write_text("{not json")
+        credentials = aws_auth.get_credentials(self.role, "Test", "eu-central-1")
+        assert credentials["AccessKeyId"] == "AKIDNEW"
+        assert self.role in orjson.loads(cache_file.read_bytes())
+
+    async def test_app_signs_with_assumed_role_credentials(self, sts):
+        with patch("main.IAM_ROLE", self.role):
+            credentials = await get_aws_credentials()
+        frozen = await credentials.get_frozen_credentials()
+        assert (frozen.access_key, frozen.token) == ("AKIDNEW", "token")
+
+    def test_naive_expiration_is_treated_as_utc(self, cache_file, sts):
+        cache = self.cached(timedelta(hours=1))
+        cache[self.role]["Expiration"] = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+        cache_file.write_bytes(orjson.dumps(cache))
+        credentials = aws_auth.get_credentials(self.role, "Test", "eu-central-1")
+        assert credentials["AccessKeyId"] == "AKIDNEW"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
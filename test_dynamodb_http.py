@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for dynamodb_http.py: requests and signatures checked against a local HTTP server.
+"""
+import pytest
+from contextlib import asynccontextmanager
+import aioboto3
+import orjson
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import Credentials
+from botocore.exceptions import ClientError
+from dynamodb_http import DynamoDBHttpClient
+
+class TestDynamoDBHttpClient:
+    """Test the hand-rolled DynamoDB client against a local HTTP server."""
+
+    credentials = Credentials("AKIDEXAMPLE", "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY")
+
+    @staticmethod
+    @asynccontextmanager
+    async def fake_dynamodb(responses):
+        """Serve canned (status, payload) responses and record each request."""
+        received = []
+
+        async def handler(request):
+            received.append({"url": str(request.url), "headers": request.headers.copy(), "body": await request.read()})
+            status, payload = responses.pop(0)
+            return web.Response(status=status, body=orjson.dumps(payload), content_type="application/x-amz-json-1.0")
+
+        server_app = web.Application()
+        server_app.router.add_post("/", handler)
+        server = TestServer(server_app)
+        await server.start_server()
+        try:
+            yield str(server.make_url("/")), received
+        finally:
+            await server.close()
+
+    def signature_is_valid(self, received):
+        """Recompute the SigV4 signature server-side from what was actually sent."""
+        authorization = received["headers"]["Authorization"]
+        signed_headers = authorization.split("SignedHeaders=")[1].split(",")[0].split(";")
+        request = AWSRequest(method="POST", url=received["url"], data=received["body"],
+                             headers={name: received["headers"][name] for name in signed_headers})
+        request.context["timestamp"] = received["headers"]["X-Amz-Date"]
+        signer = SigV4Auth(self.credentials, "dynamodb", "eu-central-1")
+        signature = signer.signature(signer.string_to_sign(request, signer.canonical_request(request)), request)
+        return authorization.endswith(f"Signature={signature}")
+
+    async def test_request_matches_aioboto3(self):
+        """Test GetItem is sent and signed the same way aioboto3 does it."""
+        params = {"TableName": "users_birthdays", "Key": {"username": {"S": "john"}}, "ProjectionExpression": "dateOfBirth"}
+        async with self.fake_dynamodb([(200, {}), (200, {})]) as (url, received):
+            session = aioboto3.Session(
+                aws_access_key_id=self.credentials.access_key,
+                aws_secret_access_key=self.credentials.secret_key,
+                region_name="eu-central-1",
+            )
+            async with session.client("dynamodb", endpoint_url=url) as boto_client:
+                await boto_client.get_item(**params)
+            async with DynamoDBHttpClient(self.credentials, "eu-central-1", url) as http_client:
+                assert await http_client.get_item(**params) == {}
+
+        boto_request, http_request = received
+        assert self.signature_is_valid(boto_request)
+        assert self.signature_is_valid(http_request)
+        for header in ("X-Amz-Target", "Content-Type"):
+            assert http_request["headers"][header] == boto_request["headers"][header]
+        assert orjson.loads(http_request["body"]) == orjson.loads(boto_request["body"])
+
+    async def test_error_raises_client_error(self):
+        """Test DynamoDB error responses are raised as ClientError with the error code."""
+        error = {"__type": "com.amazonaws.dynamodb.v20120810#ResourceNotFoundException", "message": "Table not found"}
+        async with self.fake_dynamodb([(400, error)]) as (url, received):
+            async with DynamoDBHttpClient(self.credentials, "eu-central-1", url) as http_client:
+                with pytest.raises(ClientError) as exc_info:
+                    await http_client.describe_table(TableName="users_birthdays")
+        assert exc_info.value.response["Error"]["Code"] == "ResourceNotFoundException"
+        assert len(received) == 1
+
+    async def test_throttling_is_retried(self):
+        """Test throttled requests are retried with a fresh signature."""
+        throttled = {"__type": "com.amazonaws.dynamodb.v20120810#ProvisionedThroughputExceededException"}
+        async with self.fake_dynamodb([(400, throttled), (200, {"UnprocessedItems": {}})]) as (url, received):
+            async with DynamoDBHttpClient(self.credentials, "eu-central-1", url) as http_client:
+                response = await http_client.batch_write_item(RequestItems={"users_birthdays": []})
+        assert response == {"UnprocessedItems": {}}
+        assert len(received) == 2
+        assert all(self.signature_is_valid(request) for request in received)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
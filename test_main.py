@@ -4,353 +4,521 @@ Comprehensive tests for main.py
 
 Tests all endpoints, valid and invalid inputs, edge cases, and error scenarios.
 """
+import asyncio
 import pytest
-import json
 from datetime import date, datetime, timedelta
 from unittest.mock import Mock, patch, AsyncMock
-from fastapi.testclient import TestClient
-from main import app, calculate_days_until_birthday
-
-# Test client
-client = TestClient(app)
+from freezegun import freeze_time
+import orjson
+from botocore.exceptions import ClientError
+from main import app, calculate_days_until_birthday, get_birthday, store_birthday, probe_table, WriteCoalescer
+
+# Run the app lifespan and swap DynamoDB access for stubs (see conftest.py)
+pytestmark = pytest.mark.usefixtures("app_lifespan", "stubs")
+
+# Every test runs with the clock frozen at this date
+TODAY = date(2024, 6, 15)
+
+@pytest.fixture(autouse=True)
+def frozen_today():
+    """Freeze the clock so the tests and the app agree on today's date, even across midnight."""
+    # real_asyncio keeps the event loop's monotonic clock running
+    with freeze_time(TODAY, real_asyncio=True):
+        yield
+
+# Expected bodies of fixed-shape responses, compared as bytes without decoding
+HAPPY_BIRTHDAY = orjson.dumps({"message": "Hello, john! Happy birthday!"})
+IN_1_DAY = orjson.dumps({"message": "Hello, john! Your birthday is in 1 day"})
+IN_5_DAYS = orjson.dumps({"message": "Hello, john! Your birthday is in 5 days"})
+USER_NOT_FOUND = orjson.dumps({"message": "user not found"})
+READY = orjson.dumps({"status": "ready"})
+
+# The common PUT body, serialized once
+BIRTH_BODY = orjson.dumps({"dateOfBirth": "1990-05-15"})
+JSON_HDR = {"content-type": "application/json"}
+
+def j(response):
+    """Decode a response body with orjson rather than the stdlib json module."""
+    return orjson.loads(response.content)
+
+VALID_USERNAMES = ["John", "a" * 50, "a"]
+VALID_USERNAME_IDS = ["uppercase", "max_length", "min_length"]
+
+# (username, expected status); an empty username does not match the route at all
+INVALID_USERNAMES = [("john123", 422), ("john!", 422), ("jöhn", 422), ("", 404), ("a" * 51, 422)]
+INVALID_USERNAME_IDS = ["numbers", "special_chars", "non_ascii_letters", "empty", "too_long"]
 
 class TestCalculateDaysUntilBirthday:
     """Test the birthday calculation function."""
 
-    def test_birthday_today(self):
-        """Test when birthday is today."""
-        today = date.today()
-        result = calculate_days_until_birthday(today.isoformat())
-        assert result == 0
-
-    def test_birthday_tomorrow(self):
-        """Test when birthday is tomorrow."""
-        tomorrow = date.today() + timedelta(days=1)
-        result = calculate_days_until_birthday(tomorrow.isoformat())
-        assert result == 1
-
-    def test_birthday_yesterday(self):
-        """Test when birthday was yesterday (should calculate for next year)."""
-        yesterday = date.today() - timedelta(days=1)
-        result = calculate_days_until_birthday(yesterday.isoformat())
-        assert result > 360  # Should be close to a year
-
-    def test_birthday_in_5_days(self):
-        """Test when birthday is in 5 days."""
-        future_date = date.today() + timedelta(days=5)
-        result = calculate_days_until_birthday(future_date.isoformat())
-        assert result == 5
+    @pytest.mark.parametrize("offset,expected", [
+        (0, lambda days: days == 0),
+        (1, lambda days: days == 1),
+        (5, lambda days: days == 5),
+        # Yesterday's birthday is next year's, so close to a year away
+        (-1, lambda days: days > 360),
+    ], ids=["today", "tomorrow", "in_5_days", "yesterday"])
+    def test_days_until_birthday(self, offset, expected):
+        """Test birthdays offset from today by a number of days."""
+        result = calculate_days_until_birthday((TODAY + timedelta(days=offset)).isoformat())
+        assert expected(result)
+
+    def test_leap_day_birthday_in_non_leap_year(self):
+        """Feb 29 birthdays are celebrated on Mar 1 in non-leap years."""
+        assert calculate_days_until_birthday("2000-02-29", date(2025, 2, 28)) == 1
+        assert calculate_days_until_birthday("2000-02-29", date(2025, 3, 1)) == 0
+
+    def test_leap_day_birthday_in_leap_year(self):
+        """Feb 29 birthdays fall on Feb 29 when it exists, including next year's."""
+        assert calculate_days_until_birthday("2000-02-29", date(2024, 2, 29)) == 0
+        assert calculate_days_until_birthday("2000-02-29", date(2023, 3, 2)) == 364
 
 class TestPutHelloEndpoint:
     """Test the PUT /hello/{username} endpoint."""
 
-    @patch('main.store_birthday')
-    def test_valid_birthday(self, mock_store):
+    async def test_valid_birthday(self, client, stubs):
         """Test valid birthday input."""
-        mock_store.return_value = None
-        response = client.put(
+        response = await client.put(
             "/hello/john",
-            json={"dateOfBirth": "1990-05-15"}
+            content=BIRTH_BODY, headers=JSON_HDR
         )
         assert response.status_code == 204
         assert response.content == b''  # No content
-        mock_store.assert_called_once_with("john", "1990-05-15")
+        assert stubs["stored"] == [("john", "1990-05-15")]
 
-    def test_missing_request_body(self):
+    async def test_missing_request_body(self, client):
         """Test missing request body."""
-        response = client.put("/hello/john")
+        response = await client.put("/hello/john")
         assert response.status_code == 422
 
-    def test_invalid_date_format(self):
+    async def test_invalid_date_format(self, client):
         """Test invalid date format."""
-        response = client.put(
+        response = await client.put(
             "/hello/john",
             json={"dateOfBirth": "invalid-date"}
         )
         assert response.status_code == 422
 
-    def test_future_date(self):
+    async def test_future_date(self, client):
         """Test future date (should be rejected)."""
-        future_date = date.today().replace(year=date.today().year + 1)
-        response = client.put(
+        future_date = TODAY.replace(year=TODAY.year + 1)
+        response = await client.put(
             "/hello/john",
             json={"dateOfBirth": future_date.isoformat()}
         )
         assert response.status_code == 422
-        assert "dateOfBirth must be a date before today" in response.json()["detail"][0]["msg"]
+        assert "dateOfBirth must be a date before today" in j(response)["detail"][0]["msg"]
 
-    def test_today_date(self):
+    async def test_today_date(self, client):
         """Test today's date (should be rejected)."""
-        today = date.today()
-        response = client.put(
+        response = await client.put(
             "/hello/john",
-            json={"dateOfBirth": today.isoformat()}
-        )
-        assert response.status_code == 422
-        assert "dateOfBirth must be a date before today" in response.json()["detail"][0]["msg"]
-
-    def test_invalid_username_special_chars(self):
-        """Test username with special characters."""
-        response = client.put(
-            "/hello/john123",
-            json={"dateOfBirth": "1990-05-15"}
-        )
-        assert response.status_code == 422
-
-    def test_invalid_username_numbers(self):
-        """Test username with numbers."""
-        response = client.put(
-            "/hello/john123",
-            json={"dateOfBirth": "1990-05-15"}
-        )
-        assert response.status_code == 422
-
-    def test_invalid_username_empty(self):
-        """Test empty username."""
-        response = client.put(
-            "/hello/",
-            json={"dateOfBirth": "1990-05-15"}
-        )
-        assert response.status_code == 404
-
-    def test_invalid_username_too_long(self):
-        """Test username too long."""
-        long_username = "a" * 51
-        response = client.put(
-            f"/hello/{long_username}",
-            json={"dateOfBirth": "1990-05-15"}
+            json={"dateOfBirth": TODAY.isoformat()}
         )
         assert response.status_code == 422
-
-    def test_invalid_username_too_short(self):
-        """Test username too short."""
-        response = client.put(
-            "/hello/",
-            json={"dateOfBirth": "1990-05-15"}
+        assert "dateOfBirth must be a date before today" in j(response)["detail"][0]["msg"]
+
+    @pytest.mark.parametrize("username,status", INVALID_USERNAMES, ids=INVALID_USERNAME_IDS)
+    async def test_invalid_username(self, client, username, status):
+        """Test usernames that are not 1-50 ASCII letters are rejected."""
+        response = await client.put(
+            f"/hello/{username}",
+            content=BIRTH_BODY, headers=JSON_HDR
         )
-        assert response.status_code == 404
+        assert response.status_code == status
 
 class TestGetHelloEndpoint:
     """Test the GET /hello/{username} endpoint."""
 
-    @patch('main.get_birthday')
-    def test_user_exists_birthday_today(self, mock_get):
+    async def test_user_exists_birthday_today(self, client, stubs):
         """Test user exists and birthday is today."""
-        mock_get.return_value = date.today().isoformat()
-        response = client.get("/hello/john")
+        stubs["get"] = TODAY.isoformat()
+        response = await client.get("/hello/john")
         assert response.status_code == 200
-        assert response.json() == {"message": "Hello, john! Happy birthday!"}
+        assert response.content == HAPPY_BIRTHDAY
 
-    @patch('main.get_birthday')
-    def test_user_exists_birthday_tomorrow(self, mock_get):
+    async def test_user_exists_birthday_tomorrow(self, client, stubs):
         """Test user exists and birthday is tomorrow."""
-        tomorrow = date.today() + timedelta(days=1)
-        mock_get.return_value = tomorrow.isoformat()
-        response = client.get("/hello/john")
+        stubs["get"] = (TODAY + timedelta(days=1)).isoformat()
+        response = await client.get("/hello/john")
         assert response.status_code == 200
-        assert response.json() == {"message": "Hello, john! Your birthday is in 1 day"}
+        assert response.content == IN_1_DAY
 
-    @patch('main.get_birthday')
-    def test_user_exists_birthday_in_5_days(self, mock_get):
+    async def test_user_exists_birthday_in_5_days(self, client, stubs):
         """Test user exists and birthday is in 5 days."""
-        future_date = date.today() + timedelta(days=5)
-        mock_get.return_value = future_date.isoformat()
-        response = client.get("/hello/john")
+        future_date = TODAY + timedelta(days=5)
+        stubs["get"] = future_date.isoformat()
+        response = await client.get("/hello/john")
         assert response.status_code == 200
-        assert response.json() == {"message": "Hello, john! Your birthday is in 5 days"}
+        assert response.content == IN_5_DAYS
 
-    @patch('main.get_birthday')
-    def test_user_not_found(self, mock_get):
+    async def test_user_not_found(self, client, stubs):
         """Test user not found in database."""
-        mock_get.return_value = None
-        response = client.get("/hello/john")
+        stubs["get"] = None
+        response = await client.get("/hello/john")
         assert response.status_code == 200
-        assert response.json() == {"message": "user not found"}
-
-    def test_invalid_username_special_chars(self):
-        """Test username with special characters."""
-        response = client.get("/hello/john123")
-        assert response.status_code == 422
+        assert response.content == USER_NOT_FOUND
 
-    def test_invalid_username_numbers(self):
-        """Test username with numbers."""
-        response = client.get("/hello/john123")
-        assert response.status_code == 422
+    async def test_response_has_etag(self, client, stubs):
+        """Test greeting responses carry ETag and Cache-Control headers."""
+        stubs["get"] = "1990-05-15"
+        response = await client.get("/hello/john")
+        assert response.status_code == 200
+        assert response.headers["etag"]
+        assert response.headers["cache-control"] == "private, max-age=60"
+
+    async def test_if_none_match_returns_304(self, client, stubs):
+        """Test a matching If-None-Match returns 304 without a body."""
+        stubs["get"] = "1990-05-15"
+        etag = (await client.get("/hello/john")).headers["etag"]
+        response = await client.get("/hello/john", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response.headers["etag"] == etag
+
+    async def test_etag_changes_with_birthday(self, client, stubs):
+        """Test a stale If-None-Match gets the full response."""
+        stubs["get"] = "1990-05-15"
+        etag = (await client.get("/hello/john")).headers["etag"]
+        stubs["get"] = "1991-06-16"
+        response = await client.get("/hello/john", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
 
-    def test_invalid_username_empty(self):
-        """Test empty username."""
-        response = client.get("/hello/")
-        assert response.status_code == 404
+    @pytest.mark.parametrize("username,status", INVALID_USERNAMES, ids=INVALID_USERNAME_IDS)
+    async def test_invalid_username(self, client, username, status):
+        """Test usernames that are not 1-50 ASCII letters are rejected."""
+        response = await client.get(f"/hello/{username}")
+        assert response.status_code == status
 
-    def test_invalid_username_too_long(self):
-        """Test username too long."""
-        long_username = "a" * 51
-        response = client.get(f"/hello/{long_username}")
+    async def test_invalid_username_error_shape(self, client):
+        """Test username errors use FastAPI's validation error list, like body errors do."""
+        response = await client.get("/hello/john123")
         assert response.status_code == 422
-
-    def test_invalid_username_too_short(self):
-        """Test username too short."""
-        response = client.get("/hello/")
-        assert response.status_code == 404
+        [error] = j(response)["detail"]
+        assert error["type"] == "string_pattern_mismatch"
+        assert error["loc"] == ["path", "username"]
+        assert error["input"] == "john123"
 
 class TestHealthCheckEndpoint:
     """Test the GET /hello/healthcheck endpoint."""
 
-    @patch('main.table')
-    def test_health_check_healthy(self, mock_table):
+    async def test_health_check_healthy(self, client, stubs):
         """Test health check when everything is working."""
-        # Mock successful table.load()
-        mock_table.load.return_value = None
-
-        response = client.get("/hello/healthcheck")
+        response = await client.get("/hello/healthcheck")
 
         assert response.status_code == 200
-        data = response.json()
+        data = j(response)
         assert data["status"] == "healthy"
         assert data["service"] == "revolut-birthday-api"
         assert "timestamp" in data
         assert data["checks"]["application"] == "ok"
         assert data["checks"]["database"] == "ok"
-        mock_table.load.assert_called_once()
+        assert stubs["describe_calls"] == 1
 
-    @patch('main.table')
-    def test_health_check_database_error(self, mock_table):
+    async def test_health_check_database_error(self, client, stubs):
         """Test health check when DynamoDB is unavailable."""
-        from botocore.exceptions import ClientError
-
         # Mock ClientError from DynamoDB
-        mock_table.load.side_effect = ClientError(
+        stubs["table_exc"] = ClientError(
             error_response={'Error': {'Code': 'ResourceNotFoundException', 'Message': 'Table not found'}},
             operation_name='DescribeTable'
         )
 
-        response = client.get("/hello/healthcheck")
+        response = await client.get("/hello/healthcheck")
 
         assert response.status_code == 503
-        data = response.json()["detail"]
+        data = j(response)["detail"]
         assert data["status"] == "unhealthy"
         assert data["service"] == "revolut-birthday-api"
         assert "timestamp" in data
         assert data["checks"]["application"] == "ok"
         assert data["checks"]["database"] == "error"
         assert "error" in data
-        mock_table.load.assert_called_once()
+        assert stubs["describe_calls"] == 1
 
-    @patch('main.table')
-    def test_health_check_unexpected_error(self, mock_table):
+    async def test_health_check_unexpected_error(self, client, stubs):
         """Test health check when unexpected error occurs."""
         # Mock unexpected exception
-        mock_table.load.side_effect = Exception("Unexpected error")
+        stubs["table_exc"] = Exception("Unexpected error")
 
-        response = client.get("/hello/healthcheck")
+        response = await client.get("/hello/healthcheck")
 
         assert response.status_code == 503
-        data = response.json()["detail"]
+        data = j(response)["detail"]
         assert data["status"] == "unhealthy"
         assert data["service"] == "revolut-birthday-api"
         assert "timestamp" in data
         assert data["checks"]["application"] == "error"
         assert data["checks"]["database"] == "unknown"
         assert "error" in data
-        mock_table.load.assert_called_once()
+        assert stubs["describe_calls"] == 1
 
-    def test_health_check_response_format(self):
+    async def test_health_check_response_format(self, client):
         """Test that health check response has correct format."""
-        with patch('main.table') as mock_table:
-            mock_table.load.return_value = None
+        response = await client.get("/hello/healthcheck")
 
-            response = client.get("/hello/healthcheck")
+        assert response.status_code == 200
+        data = j(response)
 
-            assert response.status_code == 200
-            data = response.json()
+        # Check required fields exist
+        required_fields = ["status", "service", "timestamp", "checks"]
+        for field in required_fields:
+            assert field in data
 
-            # Check required fields exist
-            required_fields = ["status", "service", "timestamp", "checks"]
-            for field in required_fields:
-                assert field in data
+        # Check checks structure
+        assert "application" in data["checks"]
+        assert "database" in data["checks"]
 
-            # Check checks structure
-            assert "application" in data["checks"]
-            assert "database" in data["checks"]
+        # Check timestamp format (ISO format)
+        try:
+            datetime.fromisoformat(data["timestamp"])
+        except ValueError:
+            pytest.fail("Timestamp is not in valid ISO format")
 
-            # Check timestamp format (ISO format)
-            from datetime import datetime
-            try:
-                datetime.fromisoformat(data["timestamp"])
-            except ValueError:
-                pytest.fail("Timestamp is not in valid ISO format")
+class TestReadiness:
+    """Test the GET /healthz endpoint and the background table probe."""
 
-class TestEdgeCases:
-    """Test edge cases and boundary conditions."""
-
-    @patch('main.store_birthday')
-    def test_username_with_uppercase(self, mock_store):
-        """Test username with uppercase letters."""
-        mock_store.return_value = None
-        response = client.put(
-            "/hello/John",
-            json={"dateOfBirth": "1990-05-15"}
-        )
-        assert response.status_code == 204
+    async def test_not_ready(self, client):
+        with patch.object(app.state, 'db_ready', False):
+            response = await client.get("/healthz")
+        assert response.status_code == 503
 
-    @patch('main.get_birthday')
-    def test_username_with_uppercase_get(self, mock_get):
-        """Test username with uppercase letters in GET."""
-        mock_get.return_value = None
-        response = client.get("/hello/John")
+    async def test_ready(self, client):
+        with patch.object(app.state, 'db_ready', True):
+            response = await client.get("/healthz")
         assert response.status_code == 200
+        assert response.content == READY
+
+    async def test_probe_retries_until_table_available(self):
+        dynamodb = AsyncMock()
+        dynamodb.describe_table.side_effect = [
+            ClientError({"Error": {"Code": "ResourceNotFoundException", "Message": "missing"}}, "DescribeTable"),
+            ConnectionError("unreachable"),
+            {"Table": {}},
+        ]
+        fake_app = Mock()
+        fake_app.state.db_ready = False
+        with patch("main.PROBE_INITIAL_DELAY", 0):
+            await probe_table(fake_app, dynamodb)
+        assert fake_app.state.db_ready is True
+        assert dynamodb.describe_table.call_count == 3
 
-    @patch('main.store_birthday')
-    def test_username_max_length(self, mock_store):
-        """Test username at maximum length."""
-        mock_store.return_value = None
-        max_username = "a" * 50
-        response = client.put(
-            f"/hello/{max_username}",
-            json={"dateOfBirth": "1990-05-15"}
-        )
-        assert response.status_code == 204
-
-    @patch('main.get_birthday')
-    def test_username_max_length_get(self, mock_get):
-        """Test username at maximum length in GET."""
-        mock_get.return_value = None
-        max_username = "a" * 50
-        response = client.get(f"/hello/{max_username}")
-        assert response.status_code == 200
+class TestEdgeCases:
+    """Test edge cases and boundary conditions."""
 
-    @patch('main.store_birthday')
-    def test_username_min_length(self, mock_store):
-        """Test username at minimum length."""
-        mock_store.return_value = None
-        response = client.put(
-            "/hello/a",
-            json={"dateOfBirth": "1990-05-15"}
+    @pytest.mark.parametrize("username", VALID_USERNAMES, ids=VALID_USERNAME_IDS)
+    async def test_valid_username_put(self, client, username):
+        """Test uppercase, maximum and minimum length usernames are accepted by PUT."""
+        response = await client.put(
+            f"/hello/{username}",
+            content=BIRTH_BODY, headers=JSON_HDR
         )
         assert response.status_code == 204
 
-    @patch('main.get_birthday')
-    def test_username_min_length_get(self, mock_get):
-        """Test username at minimum length in GET."""
-        mock_get.return_value = None
-        response = client.get("/hello/a")
+    @pytest.mark.parametrize("username", VALID_USERNAMES, ids=VALID_USERNAME_IDS)
+    async def test_valid_username_get(self, client, username):
+        """Test uppercase, maximum and minimum length usernames are accepted by GET."""
+        response = await client.get(f"/hello/{username}")
         assert response.status_code == 200
 
-    def test_very_old_date(self):
+    async def test_very_old_date(self, client):
         """Test very old date."""
-        response = client.put(
+        response = await client.put(
             "/hello/john",
             json={"dateOfBirth": "1900-01-01"}
         )
         assert response.status_code == 204
 
-    @patch('main.get_birthday')
-    def test_very_old_date_get(self, mock_get):
+    async def test_very_old_date_get(self, client, stubs):
         """Test very old date in GET."""
-        mock_get.return_value = "1900-01-01"
-        response = client.get("/hello/john")
+        stubs["get"] = "1900-01-01"
+        response = await client.get("/hello/john")
         assert response.status_code == 200
         # Should calculate days until next birthday
 
+class TestBirthdayCache:
+    """Test the Redis read-through cache around DynamoDB lookups."""
+
+    @pytest.fixture(autouse=True)
+    def mock_redis(self):
+        with patch('main.redis_client', new_callable=AsyncMock) as mock:
+            yield mock
+
+    @pytest.fixture
+    def mock_dynamodb(self):
+        with patch.object(app.state, 'dynamodb', new_callable=AsyncMock) as mock:
+            yield mock
+
+    @pytest.fixture
+    def mock_writer(self):
+        with patch.object(app.state, 'writer', new_callable=AsyncMock) as mock:
+            yield mock
+
+    async def test_cache_hit_skips_dynamodb(self, mock_redis, mock_dynamodb):
+        """Test cached birthday is returned without querying DynamoDB."""
+        mock_redis.get.return_value = b"1990-05-15"
+        assert await get_birthday("john") == "1990-05-15"
+        mock_redis.get.assert_called_once_with("bday:john")
+        mock_dynamodb.get_item.assert_not_called()
+
+    async def test_cache_negative_hit(self, mock_redis, mock_dynamodb):
+        """Test cached "user not found" sentinel is returned as None."""
+        mock_redis.get.return_value = b""
+        assert await get_birthday("john") is None
+        mock_dynamodb.get_item.assert_not_called()
+
+    async def test_cache_miss_populates_cache(self, mock_redis, mock_dynamodb):
+        """Test cache miss reads DynamoDB and stores the result."""
+        mock_redis.get.return_value = None
+        mock_dynamodb.get_item.return_value = {"Item": {"dateOfBirth": {"S": "1990-05-15"}}}
+        assert await get_birthday("john") == "1990-05-15"
+        # Only if missing, so a concurrent PUT's write-through is not undone
+        mock_redis.set.assert_called_once_with("bday:john", "1990-05-15", ex=300, nx=True)
+
+    async def test_cache_error_falls_back_to_dynamodb(self, mock_redis, mock_dynamodb):
+        """Test Redis failures fall back to DynamoDB transparently."""
+        mock_redis.get.side_effect = ConnectionError("redis down")
+        mock_dynamodb.get_item.return_value = {}
+        assert await get_birthday("john") is None
+        mock_dynamodb.get_item.assert_called_once()
+
+    async def test_store_writes_through(self, mock_redis, mock_writer):
+        """Test PUT updates the cache after a successful DynamoDB write."""
+        mock_writer.put.return_value = "1990-05-15"
+        await store_birthday("john", "1990-05-15")
+        mock_writer.put.assert_called_once_with("john", "1990-05-15")
+        mock_redis.set.assert_called_once_with("bday:john", "1990-05-15", ex=300, nx=False)
+
+    async def test_superseded_store_caches_the_newer_value(self, mock_redis):
+        """Test a PUT overtaken by a newer one for the same user caches the newer value."""
+        mock_client = AsyncMock()
+        writer = WriteCoalescer(mock_client, "users_birthdays")
+        newer = []
+
+        async def batch_write_item(RequestItems):
+            if not newer:
+                newer.append(asyncio.create_task(store_birthday("john", "1995-05-05")))
+                await asyncio.sleep(0)
+                return {"UnprocessedItems": {"users_birthdays": [
+                    TestWriteCoalescer.put_request("john", "1990-01-01"),
+                ]}}
+            return {"UnprocessedItems": {}}
+
+        mock_client.batch_write_item.side_effect = batch_write_item
+        writer.start()
+        try:
+            with patch.object(app.state, 'writer', writer):
+                await store_birthday("john", "1990-01-01")
+                await newer[0]
+        finally:
+            await writer.stop()
+        assert [c.args[1] for c in mock_redis.set.call_args_list] == ["1995-05-05", "1995-05-05"]
+
+class TestWriteCoalescer:
+    """Test coalescing of concurrent writes into BatchWriteItem calls."""
+
+    @staticmethod
+    def put_request(username, date_of_birth):
+        return {"PutRequest": {"Item": {"username": {"S": username}, "dateOfBirth": {"S": date_of_birth}}}}
+
+    async def test_concurrent_writes_share_one_batch(self):
+        """Test concurrent writes are sent in a single BatchWriteItem call."""
+        mock_client = AsyncMock()
+        mock_client.batch_write_item.return_value = {"UnprocessedItems": {}}
+        writer = WriteCoalescer(mock_client, "users_birthdays")
+        writer.start()
+        try:
+            await asyncio.gather(
+                writer.put("john", "1990-05-15"),
+                writer.put("jane", "1991-06-16"),
+                writer.put("john", "1992-07-17"),
+            )
+        finally:
+            await writer.stop()
+        mock_client.batch_write_item.assert_called_once_with(RequestItems={"users_birthdays": [
+            self.put_request("john", "1992-07-17"),
+            self.put_request("jane", "1991-06-16"),
+        ]})
+
+    async def test_unprocessed_items_are_retried(self):
+        """Test unprocessed items are requeued and written in a later batch."""
+        mock_client = AsyncMock()
+        mock_client.batch_write_item.side_effect = [
+            {"UnprocessedItems": {"users_birthdays": [self.put_request("john", "1990-05-15")]}},
+            {"UnprocessedItems": {}},
+        ]
+        writer = WriteCoalescer(mock_client, "users_birthdays")
+        writer.start()
+        try:
+            await writer.put("john", "1990-05-15")
+        finally:
+            await writer.stop()
+        assert mock_client.batch_write_item.call_count == 2
+
+    async def test_retry_does_not_overwrite_newer_write(self):
+        """Test an unprocessed write is dropped once a newer write for the same user exists."""
+        mock_client = AsyncMock()
+        writer = WriteCoalescer(mock_client, "users_birthdays")
+        newer = []
+
+        async def batch_write_item(RequestItems):
+            if not newer:
+                # The newer PUT arrives while the first batch is in flight
+                newer.append(asyncio.create_task(writer.put("john", "1995-05-05")))
+                await asyncio.sleep(0)
+                return {"UnprocessedItems": {"users_birthdays": [self.put_request("john", "1990-01-01")]}}
+            return {"UnprocessedItems": {}}
+
+        mock_client.batch_write_item.side_effect = batch_write_item
+        writer.start()
+        try:
+            assert await writer.put("john", "1990-01-01") == "1995-05-05"
+            assert await newer[0] == "1995-05-05"
+        finally:
+            await writer.stop()
+        written = [call.kwargs["RequestItems"]["users_birthdays"] for call in mock_client.batch_write_item.call_args_list]
+        assert written == [[self.put_request("john", "1990-01-01")], [self.put_request("john", "1995-05-05")]]
+
+    async def test_superseded_writer_shares_the_newer_failure(self):
+        """Test a writer folded into a newer write fails when that write fails."""
+        mock_client = AsyncMock()
+        writer = WriteCoalescer(mock_client, "users_birthdays")
+        newer = []
+
+        async def batch_write_item(RequestItems):
+            if not newer:
+                newer.append(asyncio.create_task(writer.put("john", "1995-05-05")))
+                await asyncio.sleep(0)
+                return {"UnprocessedItems": {"users_birthdays": [self.put_request("john", "1990-01-01")]}}
+            raise ClientError(
+                error_response={'Error': {'Code': 'ValidationException', 'Message': 'bad'}},
+                operation_name='BatchWriteItem'
+            )
+
+        mock_client.batch_write_item.side_effect = batch_write_item
+        writer.start()
+        try:
+            with pytest.raises(ClientError):
+                await writer.put("john", "1990-01-01")
+            with pytest.raises(ClientError):
+                await newer[0]
+        finally:
+            await writer.stop()
+
+    async def test_batch_error_propagates_to_writers(self):
+        """Test a failed BatchWriteItem call fails every waiting writer."""
+        mock_client = AsyncMock()
+        mock_client.batch_write_item.side_effect = ClientError(
+            error_response={'Error': {'Code': 'ValidationException', 'Message': 'bad'}},
+            operation_name='BatchWriteItem'
+        )
+        writer = WriteCoalescer(mock_client, "users_birthdays")
+        writer.start()
+        try:
+            with pytest.raises(ClientError):
+                await writer.put("john", "1990-05-15")
+        finally:
+            await writer.stop()
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"]) 
\ No newline at end of file
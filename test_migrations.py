@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for migrations.py: table creation and status polling against a stubbed DynamoDB client.
+"""
+import pytest
+import orjson
+from botocore.stub import Stubber
+from migrations import DynamoDBMigrator
+
+class TestMigrations:
+    """Test concurrent table creation and status polling with a stubbed DynamoDB client."""
+
+    @staticmethod
+    def table_config(name):
+        return {
+            "name": name,
+            "billing_mode": "PAY_PER_REQUEST",
+            "attributes": [{"name": "username", "type": "S"}],
+            "key_schema": [{"attribute_name": "username", "key_type": "HASH"}],
+        }
+
+    @pytest.fixture
+    def migrator(self):
+        migrator = DynamoDBMigrator(endpoint_url="http://localhost:8000")
+        with Stubber(migrator.client) as stubber:
+            migrator.stubber = stubber
+            yield migrator
+            stubber.assert_no_pending_responses()
+
+    @pytest.fixture
+    def config_file(self, tmp_path):
+        def write(*names):
+            path = tmp_path / "tables_config.json"
+            path.write_bytes(orjson.dumps({"tables": [self.table_config(name) for name in names]}))
+            return str(path)
+        return write
+
+    @staticmethod
+    def status(name, table_status):
+        return {"Table": {"TableName": name, "TableStatus": table_status}}
+
+    def test_existing_tables_are_skipped(self, migrator, config_file):
+        migrator.stubber.add_response("list_tables", {"TableNames": ["users_birthdays"]})
+        assert migrator.run_migrations(config_file("users_birthdays"))
+
+    def test_new_table_is_created_and_counted(self, migrator, config_file):
+        migrator.stubber.add_response("list_tables", {"TableNames": ["users_birthdays"]})
+        migrator.stubber.add_response("create_table", {})
+        migrator.stubber.add_response("describe_table", self.status("new_table", "ACTIVE"))
+        assert migrator.run_migrations(config_file("users_birthdays", "new_table"))
+
+    def test_failed_creation_fails_the_migration(self, migrator, config_file):
+        migrator.stubber.add_response("list_tables", {"TableNames": []})
+        migrator.stubber.add_client_error("create_table", "ValidationException")
+        assert not migrator.run_migrations(config_file("new_table"))
+
+    def test_denied_list_tables_falls_back_to_describe_table(self, migrator, config_file):
+        migrator.stubber.add_client_error("list_tables", "AccessDeniedException")
+        migrator.stubber.add_response("describe_table", self.status("users_birthdays", "ACTIVE"))
+        migrator.stubber.add_client_error("describe_table", "ResourceNotFoundException")
+        migrator.stubber.add_response("create_table", {})
+        migrator.stubber.add_response("describe_table", self.status("new_table", "ACTIVE"))
+        assert migrator.run_migrations(config_file("users_birthdays", "new_table"))
+
+    def test_resource_in_use_counts_as_started(self, migrator):
+        migrator.stubber.add_client_error("create_table", "ResourceInUseException")
+        assert migrator.start_table_creation(self.table_config("new_table"))
+
+    def test_wait_retries_not_found_and_fails_on_other_errors(self, migrator):
+        migrator.stubber.add_response("describe_table", self.status("aaa", "ACTIVE"))
+        migrator.stubber.add_client_error("describe_table", "ResourceNotFoundException")
+        migrator.stubber.add_client_error("describe_table", "AccessDeniedException")
+        migrator.stubber.add_response("describe_table", self.status("bbb", "ACTIVE"))
+        assert migrator.wait_for_tables(["aaa", "bbb", "ccc"], delay=0) == {"ccc"}
+
+    def test_wait_times_out(self, migrator):
+        migrator.stubber.add_response("describe_table", self.status("aaa", "CREATING"))
+        assert migrator.wait_for_tables(["aaa"], delay=0, timeout=0) == {"aaa"}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])